@@ -1,9 +1,80 @@
-import datetime
+import bisect
+import functools
 import logging
 import os
 import json
+import math
+import time
+
+log = logging.getLogger(__name__)
+
+@functools.lru_cache(maxsize=64)
+def _parse_schedule(raw, idx):
+    """Parse a 'HH:MM-HH:MM=brightness' option into a plain tuple.
+
+    Cached at module level so config RESTARTs within one Klipper
+    process skip re-parsing unchanged schedule strings."""
+    # Format: "07:00-14:00=1.0" or "14:00-19:00=0.6"
+    time_part, brightness_part = raw.split('=')
+    start_time, end_time = time_part.split('-')
+
+    start_hour, start_min = map(int, start_time.split(':'))
+    end_hour, end_min = map(int, end_time.split(':'))
+    brightness = float(brightness_part)
+
+    if not (0.0 <= brightness <= 1.0):
+        raise ValueError("Brightness must be between 0.0 and 1.0")
+
+    return (idx, start_hour, start_min, end_hour, end_min, brightness)
+
+class _Schedule:
+    """One parsed schedule entry.
+
+    Slots keep per-instance memory small and make the field reads on
+    the timer hot path plain attribute loads instead of dict probes."""
+    __slots__ = ('id', 'name', 'start_hour', 'start_min', 'end_hour',
+                 'end_min', 'start_m', 'end_m', 'brightness',
+                 'brightness_mb', 'enabled')
+
+    def __init__(self, sid, start_hour, start_min, end_hour, end_min,
+                 brightness):
+        self.id = sid
+        self.name = f'Schedule {sid}'
+        self.start_hour = start_hour
+        self.start_min = start_min
+        self.end_hour = end_hour
+        self.end_min = end_min
+        # Precomputed minutes-from-midnight so the timer tick does not
+        # redo the arithmetic on every check
+        self.start_m = start_hour * 60 + start_min
+        self.end_m = end_hour * 60 + end_min
+        self.brightness = brightness
+        # Integer millibright (0..1000) so the change-needed test on
+        # the timer path is a plain int comparison
+        self.brightness_mb = int(round(brightness * 1000))
+        self.enabled = True  # All schedules enabled by default
 
 class AutoLight:
+    # (gcode command, handler attribute, help attribute) - registered
+    # once at klippy:ready
+    _CMDS = (
+        ('SET_AUTO_LIGHT',
+         'cmd_SET_AUTO_LIGHT', 'cmd_SET_AUTO_LIGHT_help'),
+        ('AUTO_LIGHT_ENABLE',
+         'cmd_AUTO_LIGHT_ENABLE', 'cmd_AUTO_LIGHT_ENABLE_help'),
+        ('AUTO_LIGHT_DISABLE',
+         'cmd_AUTO_LIGHT_DISABLE', 'cmd_AUTO_LIGHT_DISABLE_help'),
+        ('AUTO_LIGHT_SCHEDULE_ENABLE',
+         'cmd_AUTO_LIGHT_SCHEDULE_ENABLE',
+         'cmd_AUTO_LIGHT_SCHEDULE_ENABLE_help'),
+        ('AUTO_LIGHT_SCHEDULE_DISABLE',
+         'cmd_AUTO_LIGHT_SCHEDULE_DISABLE',
+         'cmd_AUTO_LIGHT_SCHEDULE_DISABLE_help'),
+        ('AUTO_LIGHT_LIST_SCHEDULES',
+         'cmd_AUTO_LIGHT_LIST_SCHEDULES',
+         'cmd_AUTO_LIGHT_LIST_SCHEDULES_help'),
+    )
+
     def __init__(self, config):
         self.printer = config.get_printer()
         self.name = config.get_name()
@@ -11,6 +82,11 @@ class AutoLight:
         # Basic settings
         self.pin_name = config.get('pin', 'case_light')
         self.check_interval = config.getfloat('check_interval', 600.0, minval=60.0)
+        # Wakeups are rounded up to a multiple of this tolerance so the
+        # reactor can batch them with other timers due around the same
+        # time (fewer wakeups on a mostly-idle Pi). 0 disables rounding.
+        self.check_interval_tolerance = config.getfloat(
+            'check_interval_tolerance', 30.0, minval=0.0)
         self.enabled = config.getboolean('enabled', True)
 
         # State file for persisting the enabled flag across restarts.
@@ -28,51 +104,84 @@ class AutoLight:
             if schedule_str is None:
                 continue
             try:
-                # Format: "07:00-14:00=1.0" or "14:00-19:00=0.6"
-                time_part, brightness_part = schedule_str.split('=')
-                start_time, end_time = time_part.split('-')
-                
-                start_hour, start_min = map(int, start_time.split(':'))
-                end_hour, end_min = map(int, end_time.split(':'))
-                brightness = float(brightness_part)
-                
-                if not (0.0 <= brightness <= 1.0):
-                    raise ValueError("Brightness must be between 0.0 and 1.0")
-                
-                self.schedules.append({
-                    'id': i,
-                    'start_hour': start_hour,
-                    'start_min': start_min,
-                    'end_hour': end_hour,
-                    'end_min': end_min,
-                    'brightness': brightness,
-                    'enabled': True,  # All schedules enabled by default
-                    'name': f'Schedule {i}'
-                })
-                logging.info(f"AutoLight: Loaded schedule_{i}: "
-                           f"{start_hour:02d}:{start_min:02d}-{end_hour:02d}:{end_min:02d} "
-                           f"= {int(brightness*100)}%")
+                schedule = _Schedule(*_parse_schedule(schedule_str, i))
+                self.schedules.append(schedule)
+                log.info(f"AutoLight: Loaded schedule_{i}: "
+                           f"{schedule.start_hour:02d}:{schedule.start_min:02d}"
+                           f"-{schedule.end_hour:02d}:{schedule.end_min:02d} "
+                           f"= {int(schedule.brightness*100)}%")
             except Exception as e:
-                logging.error(f"AutoLight: Error parsing {option_name}: {e}")
+                log.error(f"AutoLight: Error parsing {option_name}: {e}")
                 raise config.error(f"Invalid schedule format for {option_name}: {schedule_str}")
         
         # Require at least one schedule
         if not self.schedules:
             raise config.error("AutoLight: At least one schedule (schedule_1) must be defined")
-        
-        # Validate: Must have at least 1 enabled schedule at all times
-        if len(self.schedules) < 1:
-            raise config.error("AutoLight: At least 1 schedule required")
-        
+
         # Sort schedules by start time
-        self.schedules.sort(key=lambda s: s['start_hour'] * 60 + s['start_min'])
-        
+        self.schedules.sort(key=lambda s: s.start_m)
+
+        # Index by id for the SCHEDULE_ENABLE/DISABLE commands
+        self._schedule_by_id = {s.id: s for s in self.schedules}
+
+        # Cached list of enabled schedules; kept in sync by the
+        # AUTO_LIGHT_SCHEDULE_ENABLE/DISABLE commands so the timer tick
+        # does not rebuild it on every call
+        self._enabled_schedules = list(self.schedules)
+        self._enabled_count = len(self.schedules)
+
+        # Flat interval table for bisect lookup. Schedules that cross
+        # midnight are split into two non-wrapping halves here, so the
+        # lookup never needs the start > end branch.
+        self._intervals = []
+        for s in self.schedules:
+            if s.start_m > s.end_m:  # e.g., 20:00 to 08:00
+                self._intervals.append((s.start_m, 24 * 60, s))
+                self._intervals.append((0, s.end_m, s))
+            else:
+                self._intervals.append((s.start_m, s.end_m, s))
+        self._intervals.sort(key=lambda iv: iv[0])
+        self._interval_starts = [iv[0] for iv in self._intervals]
+
+        # Distinct minute-of-day boundaries where the active schedule
+        # can change; the timer sleeps until the next one instead of
+        # polling at a fixed interval
+        self._boundaries = sorted({s.start_m for s in self.schedules}
+                                  | {s.end_m for s in self.schedules})
+
+        # Pre-rendered schedule list for get_status; Moonraker polls
+        # that endpoint frequently and only the enabled flags ever
+        # change, which _rebuild_enabled_schedules patches in place
+        self._status_schedules = [
+            {
+                'id': s.id,
+                'name': s.name,
+                'start': f"{s.start_hour:02d}:{s.start_min:02d}",
+                'end': f"{s.end_hour:02d}:{s.end_min:02d}",
+                'brightness': s.brightness,
+                'enabled': s.enabled
+            }
+            for s in self.schedules
+        ]
+
         # State tracking
         self.last_brightness = None
         self.current_schedule_id = None
+        # Last schedule returned by _find_active_schedule; reused while
+        # the clock stays inside its window (invalidated on
+        # enable/disable)
+        self._cached_active = None
+        # (eventtime, hour, minute) cache so frequent Moonraker polls do
+        # not re-read the wall clock more than about once a second
+        self._time_cache = (0.0, 0, 0)
         self.timer = None
         self.reactor = self.printer.get_reactor()
         self.gcode = None
+        # Pin access is resolved once at klippy:ready; until then fall
+        # back to the cached brightness
+        self._pin_obj = None
+        self._pin_getter = lambda: self.last_brightness
+        self._cmds_registered = False
         
         # Register event handlers
         self.printer.register_event_handler("klippy:ready", self._handle_ready)
@@ -83,25 +192,29 @@ class AutoLight:
         try:
             self.gcode = self.printer.lookup_object('gcode')
             
-            # Register commands
-            self.gcode.register_command('SET_AUTO_LIGHT',
-                                       self.cmd_SET_AUTO_LIGHT,
-                                       desc=self.cmd_SET_AUTO_LIGHT_help)
-            self.gcode.register_command('AUTO_LIGHT_ENABLE',
-                                       self.cmd_AUTO_LIGHT_ENABLE,
-                                       desc=self.cmd_AUTO_LIGHT_ENABLE_help)
-            self.gcode.register_command('AUTO_LIGHT_DISABLE',
-                                       self.cmd_AUTO_LIGHT_DISABLE,
-                                       desc=self.cmd_AUTO_LIGHT_DISABLE_help)
-            self.gcode.register_command('AUTO_LIGHT_SCHEDULE_ENABLE',
-                                       self.cmd_AUTO_LIGHT_SCHEDULE_ENABLE,
-                                       desc=self.cmd_AUTO_LIGHT_SCHEDULE_ENABLE_help)
-            self.gcode.register_command('AUTO_LIGHT_SCHEDULE_DISABLE',
-                                       self.cmd_AUTO_LIGHT_SCHEDULE_DISABLE,
-                                       desc=self.cmd_AUTO_LIGHT_SCHEDULE_DISABLE_help)
-            self.gcode.register_command('AUTO_LIGHT_LIST_SCHEDULES',
-                                       self.cmd_AUTO_LIGHT_LIST_SCHEDULES,
-                                       desc=self.cmd_AUTO_LIGHT_LIST_SCHEDULES_help)
+            # Register commands (skipped if ready fires again, since
+            # gcode raises on duplicate registration)
+            if not self._cmds_registered:
+                for cmd_name, method, help_attr in self._CMDS:
+                    self.gcode.register_command(cmd_name,
+                                                getattr(self, method),
+                                                desc=getattr(self, help_attr))
+                self._cmds_registered = True
+
+            # Resolve the output pin object once and bind a getter for
+            # it, so the timer tick needs no registry lookup or hasattr
+            # probe
+            self._pin_obj = self.printer.lookup_object(
+                f'output_pin {self.pin_name}', None)
+            if self._pin_obj is None:
+                log.warning(f"AutoLight: output_pin {self.pin_name} not found, "
+                            f"using cached brightness")
+            elif hasattr(self._pin_obj, 'last_value'):
+                self._pin_getter = (lambda p=self._pin_obj: p.last_value)
+            elif hasattr(self._pin_obj, 'value'):
+                self._pin_getter = (lambda p=self._pin_obj: p.value)
+            else:
+                log.warning("AutoLight: PIN object has no last_value or value attribute")
 
             # Restore persisted current state (overrides config default)
             self._load_current_state()
@@ -109,9 +222,9 @@ class AutoLight:
             # Start auto check if enabled
             if self.enabled:
                 self.start_auto_check()
-                logging.info("AutoLight: Automatic control started")
+                log.info("AutoLight: Automatic control started")
         except Exception as e:
-            logging.error(f"AutoLight: Initialization error: {e}")
+            log.error(f"AutoLight: Initialization error: {e}")
     
     def _handle_shutdown(self):
         """Called on shutdown - cleanup"""
@@ -140,10 +253,10 @@ class AutoLight:
                 data = json.load(f)
             if 'enabled' in data:
                 self.enabled = bool(data['enabled'])
-                logging.info(f"AutoLight: Restored persisted state: "
+                log.info(f"AutoLight: Restored persisted state: "
                              f"enabled={self.enabled}")
         except Exception as e:
-            logging.error(f"AutoLight: Could not load persisted state "
+            log.error(f"AutoLight: Could not load persisted state "
                           f"from {self.state_file}: {e}")
 
     def _save_current_state(self):
@@ -154,41 +267,77 @@ class AutoLight:
                 json.dump({'enabled': self.enabled}, f)
             os.replace(tmp_file, self.state_file)
         except Exception as e:
-            logging.error(f"AutoLight: Could not save persisted state "
+            log.error(f"AutoLight: Could not save persisted state "
                           f"to {self.state_file}: {e}")
     
-    def _get_minutes_from_midnight(self, hour, minute):
-        """Convert hour:minute to minutes from midnight"""
-        return hour * 60 + minute
-    
+    def _now_hm(self, eventtime):
+        """Return the current (hour, minute), cached per eventtime second.
+
+        The schedule only changes at minute granularity, so callers that
+        share a recent reactor eventtime can reuse the last wall-clock
+        read. On a miss, time.localtime() gives us the hour and minute
+        without allocating a datetime object."""
+        cached_et, hour, minute = self._time_cache
+        if 0.0 <= eventtime - cached_et < 1.0:
+            return hour, minute
+        lt = time.localtime()
+        self._time_cache = (eventtime, lt.tm_hour, lt.tm_min)
+        return lt.tm_hour, lt.tm_min
+
+    def _seconds_until_next_boundary(self, now_minutes, now_seconds):
+        """Seconds until the next schedule start/end boundary.
+
+        A boundary exactly at the current minute counts as a full day
+        away - when the timer fires on a boundary it must aim for the
+        following one."""
+        delta = min(((b - now_minutes) % (24 * 60)) or 24 * 60
+                    for b in self._boundaries)
+        return delta * 60 - now_seconds
+
     def _get_enabled_schedules(self):
         """Get list of currently enabled schedules"""
-        return [s for s in self.schedules if s['enabled']]
-    
+        return self._enabled_schedules
+
+    def _rebuild_enabled_schedules(self):
+        """Refresh the cached enabled-schedule list after a mutation"""
+        self._enabled_schedules = [s for s in self.schedules if s.enabled]
+        self._enabled_count = len(self._enabled_schedules)
+        self._cached_active = None
+        for s, entry in zip(self.schedules, self._status_schedules):
+            entry['enabled'] = s.enabled
+
     def _find_active_schedule(self, current_hour, current_min):
         """Find which enabled schedule should be active now"""
-        current_minutes = self._get_minutes_from_midnight(current_hour, current_min)
-        enabled_schedules = self._get_enabled_schedules()
-        
+        current_minutes = current_hour * 60 + current_min
+
+        # Fast path: the previous answer is still valid while the clock
+        # stays inside its window. Wrap-around schedules never satisfy
+        # start_m <= cm < end_m and simply take the full lookup.
+        cached = self._cached_active
+        if (cached is not None and cached.enabled
+                and cached.start_m <= current_minutes < cached.end_m):
+            return cached
+
+        enabled_schedules = self._enabled_schedules
+
         if not enabled_schedules:
-            logging.error("AutoLight: No enabled schedules! Re-enabling schedule 1")
-            self.schedules[0]['enabled'] = True
-            enabled_schedules = [self.schedules[0]]
-        
-        for schedule in enabled_schedules:
-            start_minutes = self._get_minutes_from_midnight(
-                schedule['start_hour'], schedule['start_min'])
-            end_minutes = self._get_minutes_from_midnight(
-                schedule['end_hour'], schedule['end_min'])
-            
-            # Handle schedules that cross midnight
-            if start_minutes > end_minutes:  # e.g., 20:00 to 08:00
-                if current_minutes >= start_minutes or current_minutes < end_minutes:
-                    return schedule
-            else:  # Normal schedule within same day
-                if start_minutes <= current_minutes < end_minutes:
-                    return schedule
-        
+            log.error("AutoLight: No enabled schedules! Re-enabling schedule 1")
+            self.schedules[0].enabled = True
+            self._rebuild_enabled_schedules()
+            enabled_schedules = self._enabled_schedules
+
+        # Locate the latest interval starting at or before now, then walk
+        # back over any disabled or already-ended intervals. All earlier
+        # intervals start <= current_minutes, so this visits each
+        # candidate at most once.
+        i = bisect.bisect_right(self._interval_starts, current_minutes) - 1
+        while i >= 0:
+            start_minutes, end_minutes, schedule = self._intervals[i]
+            if schedule.enabled and current_minutes < end_minutes:
+                self._cached_active = schedule
+                return schedule
+            i -= 1
+
         # If no schedule matches, use the first enabled schedule as default
         return enabled_schedules[0] if enabled_schedules else None
     
@@ -201,93 +350,106 @@ class AutoLight:
             self._timer_callback, 
             self.reactor.NOW
         )
-        logging.info("AutoLight: Timer enabled")
+        log.info("AutoLight: Timer enabled")
     
     def stop_auto_check(self):
         """Stop the timer"""
         if self.timer is not None:
             self.reactor.unregister_timer(self.timer)
             self.timer = None
-            logging.info("AutoLight: Timer disabled")
+            log.info("AutoLight: Timer disabled")
     
     def _timer_callback(self, eventtime):
         """Timer callback - runs in reactor event loop (non-blocking)"""
-        logging.info(f"AutoLight: Timer callback triggered (enabled={self.enabled})")
-        
+        # Routine per-tick messages are DEBUG only; formatting them is
+        # the dominant cost of the callback when the log is filtered
+        debug = log.isEnabledFor(logging.DEBUG)
+        if debug:
+            log.debug("AutoLight: Timer callback triggered (enabled=%s)",
+                      self.enabled)
+
         if not self.enabled:
-            logging.info("AutoLight: Timer stopped (disabled)")
+            log.info("AutoLight: Timer stopped (disabled)")
             return self.reactor.NEVER
-        
+
         try:
             # Get current time
-            now = datetime.datetime.now()
-            current_hour = now.hour
-            current_min = now.minute
-            
-            logging.info(f"AutoLight: Checking brightness at {current_hour:02d}:{current_min:02d}")
-            
+            current_hour, current_min = self._now_hm(eventtime)
+
+            if debug:
+                log.debug("AutoLight: Checking brightness at %02d:%02d",
+                          current_hour, current_min)
+
             # Find active schedule
             active_schedule = self._find_active_schedule(current_hour, current_min)
-            
+
             if active_schedule:
-                target_brightness = active_schedule['brightness']
-                schedule_name = active_schedule['name']
-                schedule_id = active_schedule['id']
-                
-                logging.info(f"AutoLight: Active {schedule_name} "
-                           f"({active_schedule['start_hour']:02d}:{active_schedule['start_min']:02d}"
-                           f"-{active_schedule['end_hour']:02d}:{active_schedule['end_min']:02d}) "
-                           f"Target: {int(target_brightness*100)}%")
-                
-                # Get current PIN value
-                current_pin_value = None
+                target_brightness = active_schedule.brightness
+                schedule_name = active_schedule.name
+                schedule_id = active_schedule.id
+
+                if debug:
+                    log.debug("AutoLight: Active %s (%02d:%02d-%02d:%02d) "
+                              "Target: %d%%", schedule_name,
+                              active_schedule.start_hour,
+                              active_schedule.start_min,
+                              active_schedule.end_hour,
+                              active_schedule.end_min,
+                              int(target_brightness * 100))
+
+                # Get current PIN value through the getter bound at ready
                 try:
-                    pin_obj = self.printer.lookup_object(f'output_pin {self.pin_name}')
-                    if hasattr(pin_obj, 'last_value'):
-                        current_pin_value = pin_obj.last_value
-                        logging.info(f"AutoLight: Read PIN value from last_value: {current_pin_value}")
-                    elif hasattr(pin_obj, 'value'):
-                        current_pin_value = pin_obj.value
-                        logging.info(f"AutoLight: Read PIN value from value: {current_pin_value}")
-                    else:
-                        logging.warning(f"AutoLight: PIN object has no last_value or value attribute")
-                        logging.warning(f"AutoLight: Available attributes: {dir(pin_obj)}")
-                        current_pin_value = self.last_brightness
+                    current_pin_value = self._pin_getter()
                 except Exception as e:
-                    logging.warning(f"AutoLight: Could not read PIN value ({e}), using cached")
+                    log.warning("AutoLight: Could not read PIN value (%s), using cached", e)
                     current_pin_value = self.last_brightness
-                
-                # If we still don't have a value, use 0
-                if current_pin_value is None:
-                    logging.warning(f"AutoLight: No PIN value available, assuming 0")
-                    current_pin_value = 0
-                
-                logging.info(f"AutoLight: Comparison - Current: {current_pin_value}, Target: {target_brightness}")
-                
-                # Check if change is needed
-                brightness_diff = abs(target_brightness - current_pin_value)
-                
-                if brightness_diff > 0.01:
-                    logging.info(f"AutoLight: Brightness change needed: {current_pin_value} -> "
-                               f"{target_brightness} (diff: {brightness_diff:.3f})")
-                    self.reactor.register_callback(
-                        lambda et: self._set_brightness(target_brightness, schedule_name, 
-                                                       current_hour, current_min)
-                    )
+
+                if debug:
+                    log.debug("AutoLight: Comparison - Current: %s, Target: %s",
+                              current_pin_value, target_brightness)
+
+                # Check if change is needed: compare integer millibright
+                # values; an unknown pin value (-1) always triggers an
+                # update unless the target is off anyway
+                target_mb = active_schedule.brightness_mb
+                cur_mb = (-1 if current_pin_value is None
+                          else int(round(current_pin_value * 1000)))
+
+                if abs(target_mb - cur_mb) > 10:
+                    if debug:
+                        log.debug("AutoLight: Brightness change needed: %s -> %s",
+                                  current_pin_value, target_brightness)
+                    # The timer already runs in the reactor context, so
+                    # emit the gcode directly instead of allocating a
+                    # closure and bouncing through another callback
+                    self._set_brightness(target_brightness, schedule_name,
+                                         current_hour, current_min)
                     self.last_brightness = target_brightness
                     self.current_schedule_id = schedule_id
-                else:
-                    logging.info(f"AutoLight: Brightness unchanged at {target_brightness} "
-                               f"(diff: {brightness_diff:.3f})")
+                elif debug:
+                    log.debug("AutoLight: Brightness unchanged at %s",
+                              target_brightness)
             else:
-                logging.warning("AutoLight: No active schedule found!")
-            
+                log.warning("AutoLight: No active schedule found!")
+
         except Exception as e:
-            logging.error(f"AutoLight: Timer error: {e}")
-        
-        # Return next execution time
-        next_time = eventtime + self.check_interval
-        logging.info(f"AutoLight: Next check in {self.check_interval}s")
+            log.error(f"AutoLight: Timer error: {e}")
+
+        # Sleep until just past the next schedule boundary; check_interval
+        # caps the sleep so wall-clock jumps are picked up eventually
+        lt = time.localtime()
+        delay = self._seconds_until_next_boundary(
+            lt.tm_hour * 60 + lt.tm_min, lt.tm_sec) + 1.0
+        delay = max(1.0, min(self.check_interval, delay))
+        next_time = eventtime + delay
+        # Round up to the tolerance grid so nearby timers coalesce into
+        # a single wakeup; a brightness change arriving a few seconds
+        # late is invisible
+        tolerance = self.check_interval_tolerance
+        if tolerance:
+            next_time = math.ceil(next_time / tolerance) * tolerance
+        if debug:
+            log.debug("AutoLight: Next check in %.0fs", next_time - eventtime)
         return next_time
     
     def _set_brightness(self, brightness, schedule_name, hour, minute):
@@ -303,24 +465,24 @@ class AutoLight:
                   f"Brightness {int(brightness * 100)}% "
                   f"(Time: {hour:02d}:{minute:02d})")
             self.gcode.respond_info(msg)
-            logging.info(msg)
+            log.info(msg)
             
         except Exception as e:
-            logging.error(f"AutoLight: Brightness adjustment error: {e}")
+            log.error(f"AutoLight: Brightness adjustment error: {e}")
     
     def _manual_check(self):
         """Manual check (for G-code command)"""
         try:
-            now = datetime.datetime.now()
-            active_schedule = self._find_active_schedule(now.hour, now.minute)
-            
+            hour, minute = self._now_hm(self.reactor.monotonic())
+            active_schedule = self._find_active_schedule(hour, minute)
+
             if active_schedule:
-                brightness = active_schedule['brightness']
-                schedule_name = active_schedule['name']
-                self._set_brightness(brightness, schedule_name, now.hour, now.minute)
+                brightness = active_schedule.brightness
+                schedule_name = active_schedule.name
+                self._set_brightness(brightness, schedule_name, hour, minute)
                 self.last_brightness = brightness
-                self.current_schedule_id = active_schedule['id']
-                logging.info(f"AutoLight: Manual check executed, using {schedule_name}")
+                self.current_schedule_id = active_schedule.id
+                log.info(f"AutoLight: Manual check executed, using {schedule_name}")
             else:
                 if self.gcode:
                     self.gcode.respond_info("AutoLight: No active schedule found")
@@ -328,7 +490,7 @@ class AutoLight:
         except Exception as e:
             if self.gcode:
                 self.gcode.respond_info(f"AutoLight Error: {e}")
-            logging.error(f"AutoLight: Manual check failed: {e}")
+            log.error(f"AutoLight: Manual check failed: {e}")
     
     # ===== G-CODE COMMANDS =====
     
@@ -345,7 +507,7 @@ class AutoLight:
         self.start_auto_check()
         self._save_current_state()
         gcmd.respond_info("AutoLight: ENABLED")
-        logging.info("AutoLight: Enabled via G-code")
+        log.info("AutoLight: Enabled via G-code")
     
     cmd_AUTO_LIGHT_DISABLE_help = "Disable automatic light control"
     def cmd_AUTO_LIGHT_DISABLE(self, gcmd):
@@ -354,23 +516,24 @@ class AutoLight:
         self.stop_auto_check()
         self._save_current_state()
         gcmd.respond_info("AutoLight: DISABLED")
-        logging.info("AutoLight: Disabled via G-code")
+        log.info("AutoLight: Disabled via G-code")
     
     cmd_AUTO_LIGHT_SCHEDULE_ENABLE_help = "Enable a specific schedule (ID=1-5)"
     def cmd_AUTO_LIGHT_SCHEDULE_ENABLE(self, gcmd):
         """Enable a specific schedule"""
         try:
             schedule_id = gcmd.get_int('ID', minval=1, maxval=5)
-            
-            for schedule in self.schedules:
-                if schedule['id'] == schedule_id:
-                    schedule['enabled'] = True
-                    gcmd.respond_info(f"AutoLight: Enabled {schedule['name']}")
-                    logging.info(f"AutoLight: Schedule {schedule_id} enabled via G-code")
-                    return
-            
-            gcmd.respond_info(f"AutoLight: Schedule {schedule_id} not found in config")
-            
+
+            schedule = self._schedule_by_id.get(schedule_id)
+            if schedule is None:
+                gcmd.respond_info(f"AutoLight: Schedule {schedule_id} not found in config")
+                return
+
+            schedule.enabled = True
+            self._rebuild_enabled_schedules()
+            gcmd.respond_info(f"AutoLight: Enabled {schedule.name}")
+            log.info(f"AutoLight: Schedule {schedule_id} enabled via G-code")
+
         except Exception as e:
             gcmd.respond_info(f"AutoLight: Error: {e}")
     
@@ -380,26 +543,23 @@ class AutoLight:
         try:
             schedule_id = gcmd.get_int('ID', minval=1, maxval=5)
             
-            # Count currently enabled schedules
-            enabled_count = sum(1 for s in self.schedules if s['enabled'])
-            
-            if enabled_count <= 1:
+            if self._enabled_count <= 1:
                 gcmd.respond_info("AutoLight: Cannot disable - at least one schedule must remain enabled")
                 return
-            
-            for schedule in self.schedules:
-                if schedule['id'] == schedule_id:
-                    if not schedule['enabled']:
-                        gcmd.respond_info(f"AutoLight: {schedule['name']} is already disabled")
-                        return
-                    
-                    schedule['enabled'] = False
-                    gcmd.respond_info(f"AutoLight: Disabled {schedule['name']}")
-                    logging.info(f"AutoLight: Schedule {schedule_id} disabled via G-code")
-                    return
-            
-            gcmd.respond_info(f"AutoLight: Schedule {schedule_id} not found in config")
-            
+
+            schedule = self._schedule_by_id.get(schedule_id)
+            if schedule is None:
+                gcmd.respond_info(f"AutoLight: Schedule {schedule_id} not found in config")
+                return
+            if not schedule.enabled:
+                gcmd.respond_info(f"AutoLight: {schedule.name} is already disabled")
+                return
+
+            schedule.enabled = False
+            self._rebuild_enabled_schedules()
+            gcmd.respond_info(f"AutoLight: Disabled {schedule.name}")
+            log.info(f"AutoLight: Schedule {schedule_id} disabled via G-code")
+
         except Exception as e:
             gcmd.respond_info(f"AutoLight: Error: {e}")
     
@@ -410,40 +570,29 @@ class AutoLight:
             gcmd.respond_info("AutoLight: No schedules configured")
             return
         
-        enabled_count = sum(1 for s in self.schedules if s['enabled'])
         gcmd.respond_info(f"AutoLight: {len(self.schedules)} schedule(s) configured "
-                         f"({enabled_count} enabled):")
+                         f"({self._enabled_count} enabled):")
         
         for schedule in self.schedules:
-            status = "ENABLED" if schedule['enabled'] else "DISABLED"
-            gcmd.respond_info(f"  {schedule['id']}. {schedule['name']} [{status}]: "
-                            f"{schedule['start_hour']:02d}:{schedule['start_min']:02d}"
-                            f"-{schedule['end_hour']:02d}:{schedule['end_min']:02d} "
-                            f"= {int(schedule['brightness']*100)}%")
+            status = "ENABLED" if schedule.enabled else "DISABLED"
+            gcmd.respond_info(f"  {schedule.id}. {schedule.name} [{status}]: "
+                            f"{schedule.start_hour:02d}:{schedule.start_min:02d}"
+                            f"-{schedule.end_hour:02d}:{schedule.end_min:02d} "
+                            f"= {int(schedule.brightness*100)}%")
     
     def get_status(self, eventtime):
         """Return status for Moonraker API"""
-        now = datetime.datetime.now()
-        active_schedule = self._find_active_schedule(now.hour, now.minute)
-        
+        hour, minute = self._now_hm(eventtime)
+        active_schedule = self._find_active_schedule(hour, minute)
+
         return {
             'enabled': self.enabled,
             'current_brightness': self.last_brightness,
-            'target_brightness': active_schedule['brightness'] if active_schedule else None,
-            'active_schedule_id': active_schedule['id'] if active_schedule else None,
-            'active_schedule_name': active_schedule['name'] if active_schedule else None,
-            'current_time': f"{now.hour:02d}:{now.minute:02d}",
-            'schedules': [
-                {
-                    'id': s['id'],
-                    'name': s['name'],
-                    'start': f"{s['start_hour']:02d}:{s['start_min']:02d}",
-                    'end': f"{s['end_hour']:02d}:{s['end_min']:02d}",
-                    'brightness': s['brightness'],
-                    'enabled': s['enabled']
-                }
-                for s in self.schedules
-            ]
+            'target_brightness': active_schedule.brightness if active_schedule else None,
+            'active_schedule_id': active_schedule.id if active_schedule else None,
+            'active_schedule_name': active_schedule.name if active_schedule else None,
+            'current_time': f"{hour:02d}:{minute:02d}",
+            'schedules': self._status_schedules
         }
 
 def load_config(config):